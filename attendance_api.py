@@ -1,10 +1,23 @@
-from flask import Flask, jsonify, request, render_template
-from std_db import Student, AttendanceSystem
-from datetime import datetime
-import traceback
+# Patch the stdlib first so pymysql's socket reads yield to other greenlets
+from gevent import monkey
+monkey.patch_all()
+
+from flask import Flask, Response, request, render_template, stream_with_context
+from std_db import Student, AttendanceSystem, NotFoundError, AlreadyExistsError
+from datetime import date
+import logging
+import orjson
 import time
+import os
+import zlib
 import pymysql
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
+
+# Debug/info lines stay disabled unless LOG_LEVEL asks for them
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'WARNING'))
+logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, 
@@ -15,6 +28,131 @@ app = Flask(__name__,
 # Enable CORS
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+class StreamSafeCompress(Compress):
+    # Flask-Compress buffers the whole body to compress it; streamed responses gzip themselves
+    def after_request(self, response):
+        if response.is_streamed:
+            return response
+        return super().after_request(response)
+
+# Compress JSON responses
+app.config.update(
+    COMPRESS_MIN_SIZE=500,
+    COMPRESS_LEVEL=6
+)
+StreamSafeCompress(app)
+
+# Redis-backed cache for the read endpoints
+cache = Cache(app, config={
+    'CACHE_TYPE': 'RedisCache',
+    'CACHE_REDIS_URL': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+    'CACHE_DEFAULT_TIMEOUT': 300
+})
+
+def safe_cache(op, *args, **kwargs):
+    # Redis is only an optimisation: if it is unreachable, log and carry on without it
+    try:
+        return op(*args, **kwargs)
+    except Exception as e:
+        logger.warning("Cache %s failed: %s", op.__name__, e)
+        return None
+
+# Bounds of the signed INT id/student_id columns
+MYSQL_INT_MIN, MYSQL_INT_MAX = -2**31, 2**31 - 1
+
+def parse_student_id(value):
+    """int() a client-supplied id and check it fits the INT columns; raises ValueError otherwise"""
+    student_id = int(value)
+    if not MYSQL_INT_MIN <= student_id <= MYSQL_INT_MAX:
+        raise ValueError(f'student id {student_id} is outside the range {MYSQL_INT_MIN}..{MYSQL_INT_MAX}')
+    return student_id
+
+def student_fields_error(data):
+    """Return an error message if name/class would not fit the students columns, else None"""
+    for field, max_length in (('name', 100), ('class', 50)):
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip() or len(value) > max_length:
+            return f'{field} must be a non-empty string of at most {max_length} characters'
+    return None
+
+def ojsonify(obj):
+    # orjson serialises dicts, lists and date objects in C
+    return Response(orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC), mimetype='application/json')
+
+def cacheable(rv):
+    # Error paths return (response, status) tuples; only plain 200 responses are cached
+    return not isinstance(rv, tuple)
+
+def student_cache_key():
+    return f"student:{request.view_args['sid']}"
+
+def attendance_cache_keys(records):
+    """Build cache keys for (student_id, date) pairs with a single Redis round-trip"""
+    # Namespaced by a per-student generation so deleting a student orphans all of its entries at once
+    student_ids = list({sid for sid, _ in records})
+    generations = dict(zip(student_ids, cache.get_many(*[f'attendance:{sid}:gen' for sid in student_ids])))
+    return [f"attendance:{sid}:{generations[sid] or 0}:{at_date}" for sid, at_date in records]
+
+def attendance_cache_key(student_id, at_date):
+    return attendance_cache_keys([(student_id, at_date)])[0]
+
+def attendance_view_cache_key():
+    student_id = request.view_args['student_id']
+    at_date = request.view_args['date_str']
+    try:
+        # Normalise so the key matches the one invalidated on writes
+        at_date = date.fromisoformat(at_date)
+    except ValueError:
+        pass
+    return attendance_cache_key(student_id, at_date)
+
+def students_version():
+    # Shared through Redis so every worker hands out the same ETag
+    version = cache.get('students:version')
+    if version is None:
+        # Seed from the clock so a lost key never reissues an ETag a client may still hold
+        cache.add('students:version', int(time.time() * 1000), timeout=0)
+        version = cache.get('students:version')
+    return version
+
+def invalidate_student(sid):
+    def invalidate():
+        # Bumping the version retires the students:all:<version> body along with the old ETag
+        cache.delete(f'student:{sid}')
+        cache.inc(f'attendance:{sid}:gen')
+        students_version()
+        cache.inc('students:version')
+    # Runs after the MySQL commit, so a Redis outage must not fail the request
+    safe_cache(invalidate)
+
+def matching_etag(version):
+    """Return the If-None-Match tag naming this students version, if the client sent one"""
+    # Flask-Compress rewrites "v<N>" to "v<N>:gzip"/"v<N>:br" on compressed responses
+    for tag in request.if_none_match.as_set(include_weak=True):
+        if tag.split(':', 1)[0] == f'v{version}':
+            return tag
+    return None
+
+def invalidate_attendance(*records):
+    def invalidate():
+        cache.delete_many(*attendance_cache_keys(records))
+    safe_cache(invalidate)
+
+def generate_json(rows):
+    # Emit a JSON array one row at a time so the full result never sits in memory
+    yield b'['
+    for i, row in enumerate(rows):
+        yield (b',' if i else b'') + orjson.dumps(row)
+    yield b']'
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
 # Initialize DAO with retry mechanism
 def init_system(max_retries=5):
     for attempt in range(max_retries):
@@ -37,39 +175,35 @@ def init_system(max_retries=5):
                 # Ensure database and tables exist
                 system.create_database()
                 system.create_tables()
+                # Share warm connections across the worker's greenlets. Every gunicorn worker has its
+                # own pool, so WEB_CONCURRENCY * DB_POOL_MAX must stay below MySQL's max_connections
+                # (151 by default); the defaults use 4 * 30 = 120 and leave headroom for other clients.
+                system.init_pool(
+                    mincached=int(os.environ.get('DB_POOL_MIN', 5)),
+                    maxcached=int(os.environ.get('DB_POOL_IDLE', 20)),
+                    maxconnections=int(os.environ.get('DB_POOL_MAX', 30))
+                )
                 return system
         except pymysql.Error as e:
             if attempt < max_retries - 1:
-                print(f"Database connection failed (attempt {attempt + 1}/{max_retries}): {str(e)}")
+                logger.warning("Database connection failed (attempt %d/%d): %s", attempt + 1, max_retries, e)
                 time.sleep(2)  # Wait 2 seconds before retrying
             else:
-                print(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
+                logger.error("Failed to connect to database after %d attempts: %s", max_retries, e)
                 raise
         except Exception as e:
-            print(f"Unexpected error during initialization: {str(e)}")
+            logger.error("Unexpected error during initialization: %s", e)
             raise
     return None
 
-# Global system instance
-system = None
-
-@app.before_first_request
-def initialize_system():
-    global system
-    if system is None:
-        try:
-            system = init_system()
-            if system is None:
-                raise Exception("Failed to initialize database system")
-        except Exception as e:
-            print(f"System initialization failed: {str(e)}")
-            raise
+# Global system instance, created once per worker process at import
+system = init_system()
+if system is None:
+    raise Exception("Failed to initialize database system")
 
 @app.route('/')
 def home():
     try:
-        if system is None:
-            raise Exception("Database system not initialized")
         return render_template('index.html')
     except Exception as e:
         return render_template('error.html', error=str(e))
@@ -77,257 +211,271 @@ def home():
 # ----- Error Handlers -----
 @app.errorhandler(500)
 def handle_500(error):
-    return jsonify({'error': 'Internal server error', 'details': str(error)}), 500
+    return ojsonify({'error': 'Internal server error', 'details': str(error)}), 500
 
 @app.errorhandler(404)
 def handle_404(error):
-    return jsonify({'error': 'Not found', 'details': str(error)}), 404
+    return ojsonify({'error': 'Not found', 'details': str(error)}), 404
 
 # ----- Student Endpoints -----
 @app.route('/students', methods=['GET'])
 def list_students():
     try:
-        if system is None:
-            raise Exception("Database system not initialized")
-            
-        rows = system.list_students()
-        students = [
-            {'id': r['id'], 'name': r['name'], 'class': r['class']} for r in rows
-        ]
-        return jsonify(students)
+        version = safe_cache(students_version)
+        if version is None:
+            # Redis is down: no shared version to validate against, so serve straight from MySQL
+            return ojsonify(system.list_students())
+
+        tag = matching_etag(version)
+        if tag:
+            response = Response(status=304)
+            response.set_etag(tag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        # The body is keyed by the version read above, so a body can never outlive its ETag
+        key = f'students:all:{version}'
+        body = safe_cache(cache.get, key)
+        if body is None:
+            # DictCursor rows already carry the response keys
+            body = orjson.dumps(system.list_students())
+            safe_cache(cache.set, key, body, timeout=300)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(f'v{version}')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
-        print(f"Error in list_students: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error in list_students: %s", e)
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/students', methods=['POST'])
 def create_student():
-    try:
-        if system is None:
-            raise Exception("Database system not initialized")
-            
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-            
-        required_fields = ['id', 'name', 'class']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-
-        try:
-            student_id = int(data['id'])
-            student = Student(
-                name=data['name'],
-                student_class=data['class']
-            )
-        except ValueError:
-            return jsonify({'error': 'ID must be a valid integer'}), 400
-        
-        try:
-            sid = system.add_student(student, student_id)
-            row = system.get_student(sid)
-            return jsonify({
-                'id': row['id'],
-                'name': row['name'],
-                'class': row['class']
-            }), 201
-        except Exception as e:
-            return jsonify({'error': str(e)}), 400
+    # Validation failures return early and never reach the error logging below
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return ojsonify({'error': 'No data provided'}), 400
         
+    required_fields = ['id', 'name', 'class']
+    for field in required_fields:
+        if field not in data:
+            return ojsonify({'error': f'Missing required field: {field}'}), 400
+
+    try:
+        student_id = parse_student_id(data['id'])
+    except (TypeError, ValueError):
+        return ojsonify({'error': f'ID must be an integer between {MYSQL_INT_MIN} and {MYSQL_INT_MAX}'}), 400
+    # Mirror the column definitions so bad input is a 400, not a database error
+    error = student_fields_error(data)
+    if error:
+        return ojsonify({'error': error}), 400
+    student = Student(
+        name=data['name'],
+        student_class=data['class']
+    )
+    
+    try:
+        sid = system.add_student(student, student_id)
+        invalidate_student(sid)
+        return ojsonify({
+            'id': sid,
+            'name': student.name,
+            'class': student.student_class
+        }), 201
+    except AlreadyExistsError as e:
+        return ojsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"Error in create_student: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        logger.exception("Error in create_student")
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/students/<int:sid>', methods=['GET'])
+@cache.cached(timeout=300, key_prefix=student_cache_key, response_filter=cacheable)
 def read_student(sid):
     try:
         row = system.get_student(sid)
         if not row:
-            return jsonify({'message': 'Student not found'}), 404
-        return jsonify({
-            'id': row['id'],
-            'name': row['name'],
-            'class': row['class']
-        })
+            return ojsonify({'message': 'Student not found'}), 404
+        return ojsonify(row)
     except Exception as e:
-        print(f"Error in read_student: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error("Error in read_student: %s", e)
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/students/<int:sid>', methods=['PUT'])
 def update_student(sid):
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return ojsonify({'error': 'No data provided'}), 400
+    # Same rules as create_student
+    error = student_fields_error(data)
+    if error:
+        return ojsonify({'error': error}), 400
+
     try:
-        data = request.get_json()
-        existing = system.get_student(sid)
-        if not existing:
-            return jsonify({'message': 'Student not found'}), 404
         updated = Student(
             name=data.get('name'),
             student_class=data.get('class')
         )
-        system.update_student(sid, updated)
-        row = system.get_student(sid)
-        return jsonify({
-            'id': row['id'],
-            'name': row['name'],
-            'class': row['class']
+        if not system.update_student(sid, updated):
+            return ojsonify({'message': 'Student not found'}), 404
+        invalidate_student(sid)
+        return ojsonify({
+            'id': sid,
+            'name': updated.name,
+            'class': updated.student_class
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return ojsonify({'error': str(e)}), 400
 
 @app.route('/students/<int:sid>', methods=['DELETE'])
 def delete_student(sid):
     try:
-        existing = system.get_student(sid)
-        if not existing:
-            return jsonify({'message': 'Student not found'}), 404
-        system.delete_student(sid)
-        return jsonify({'message': f'Student id={sid} deleted'})
+        if not system.delete_student(sid):
+            return ojsonify({'message': 'Student not found'}), 404
+        invalidate_student(sid)
+        return ojsonify({'message': f'Student id={sid} deleted'})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 # ----- Attendance Endpoints -----
 @app.route('/attendance', methods=['GET'])
 def list_all_attendance():
     try:
-        if system is None:
-            raise Exception("Database system not initialized")
-            
-        rows = system.list_all_attendance()
-        records = [
-            {
-                'student_id': r['student_id'],
-                'name': r['name'],
-                'class': r['class'],
-                'date': str(r['date']),
-                'status': r['status']
-            }
-            for r in rows
-        ]
-        return jsonify(records)
+        rows = system.iter_all_attendance()
+        body = generate_json(rows)
+        headers = {'Vary': 'Accept-Encoding'}
+        # Indexing reads the q-value (and honours "*"), so "gzip;q=0" counts as a refusal
+        if request.accept_encodings['gzip'] > 0:
+            body = gzip_stream(body)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(stream_with_context(body), mimetype='application/json', headers=headers)
     except Exception as e:
-        print(f"Error in list_all_attendance: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error in list_all_attendance: %s", e)
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/attendance', methods=['POST'])
 def mark_attendance():
+    # Validation failures return early and never reach the error logging below
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return ojsonify({'error': 'No data provided'}), 400
+        
+    required_fields = ['student_id', 'date', 'status']
+    for field in required_fields:
+        if field not in data:
+            return ojsonify({'error': f'Missing required field: {field}'}), 400
+
     try:
-        if system is None:
-            raise Exception("Database system not initialized")
-            
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-            
-        required_fields = ['student_id', 'date', 'status']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        student_id = parse_student_id(data['student_id'])
+        at_date = date.fromisoformat(data['date'])
+    except (TypeError, ValueError) as e:
+        return ojsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    status = data['status']
+    
+    # Validate status
+    if status not in ['Present', 'Absent']:
+        return ojsonify({'error': 'Status must be either Present or Absent'}), 400
 
+    try:
+        created = system.mark_attendance(student_id, at_date, status)
+        invalidate_attendance((student_id, at_date))
+        return ojsonify({
+            'student_id': student_id,
+            'date': at_date,
+            'status': status
+        }), 201 if created else 200
+    except NotFoundError as e:
+        return ojsonify({'error': str(e)}), 404
+    except Exception as e:
+        logger.exception("Error in mark_attendance")
+        return ojsonify({'error': str(e)}), 500
+
+@app.route('/attendance/bulk', methods=['POST'])
+def mark_attendance_bulk():
+    # Validation failures return early and never reach the error logging below
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, list):
+        return ojsonify({'error': 'Expected a non-empty list of attendance records'}), 400
+
+    required_fields = ['student_id', 'date', 'status']
+    records = []
+    for i, item in enumerate(data):
+        if not isinstance(item, dict):
+            return ojsonify({'error': f'Record {i}: expected an object'}), 400
+        for field in required_fields:
+            if field not in item:
+                return ojsonify({'error': f'Record {i}: missing required field: {field}'}), 400
         try:
-            student_id = int(data['student_id'])
-            at_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-            status = data['status']
-            
-            # Validate status
-            if status not in ['Present', 'Absent']:
-                return jsonify({'error': 'Status must be either Present or Absent'}), 400
-                
-            # Check if student exists
-            student = system.get_student(student_id)
-            if not student:
-                return jsonify({'error': f'Student with ID {student_id} not found'}), 404
-                
-            result = system.mark_attendance(student_id, at_date, status)
-            if not result:
-                return jsonify({'error': 'Failed to mark attendance'}), 500
-                
-            row = system.get_attendance(student_id, at_date)
-            return jsonify({
-                'student_id': row['student_id'],
-                'date': str(row['date']),
-                'status': row['status']
-            }), 201
-            
-        except ValueError as e:
-            return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
-        except Exception as e:
-            return jsonify({'error': str(e)}), 400
-            
+            student_id = parse_student_id(item['student_id'])
+            at_date = date.fromisoformat(item['date'])
+        except (TypeError, ValueError) as e:
+            return ojsonify({'error': f'Record {i}: invalid data format: {str(e)}'}), 400
+        if item['status'] not in ['Present', 'Absent']:
+            return ojsonify({'error': f'Record {i}: status must be either Present or Absent'}), 400
+        records.append((student_id, at_date, item['status']))
+
+    try:
+        count = system.mark_attendance_bulk(records)
+        invalidate_attendance(*[(sid, at_date) for sid, at_date, _ in records])
+        # Always 201 with the submitted count: a batch may mix new and existing days
+        return ojsonify({'submitted': count}), 201
+    except NotFoundError as e:
+        return ojsonify({'error': str(e)}), 404
     except Exception as e:
-        print(f"Error in mark_attendance: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        logger.exception("Error in mark_attendance_bulk")
+        return ojsonify({'error': str(e)}), 500
 
-@app.route('/attendance/<int:student_id>/<string:date>', methods=['GET'])
-def get_attendance(student_id, date):
+@app.route('/attendance/<int:student_id>/<string:date_str>', methods=['GET'])
+@cache.cached(timeout=300, key_prefix=attendance_view_cache_key, response_filter=cacheable)
+def get_attendance(student_id, date_str):
     try:
-        at_date = datetime.strptime(date, '%Y-%m-%d').date()
+        at_date = date.fromisoformat(date_str)
         row = system.get_attendance(student_id, at_date)
         if not row:
-            return jsonify({'message': 'Attendance record not found'}), 404
-        return jsonify({
-            'student_id': row['student_id'],
-            'date': str(row['date']),
-            'status': row['status']
-        })
+            return ojsonify({'message': 'Attendance record not found'}), 404
+        return ojsonify(row)
     except ValueError:
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        return ojsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/attendance/student/<int:student_id>', methods=['GET'])
 def list_attendance_for_student(student_id):
     try:
-        rows = system.list_attendance_by_student(student_id)
-        records = [{'date': str(r['date']), 'status': r['status']} for r in rows]
-        return jsonify(records)
+        return ojsonify(system.list_attendance_by_student(student_id))
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
-@app.route('/attendance/<int:student_id>/<string:date>', methods=['PUT'])
-def update_attendance(student_id, date):
+@app.route('/attendance/<int:student_id>/<string:date_str>', methods=['PUT'])
+def update_attendance(student_id, date_str):
     try:
-        at_date = datetime.strptime(date, '%Y-%m-%d').date()
+        at_date = date.fromisoformat(date_str)
         data = request.get_json()
-        existing = system.get_attendance(student_id, at_date)
-        if not existing:
-            return jsonify({'message': 'Record not found'}), 404
         new_status = data.get('status')
-        system.update_attendance(student_id, at_date, new_status)
-        row = system.get_attendance(student_id, at_date)
-        return jsonify({
-            'student_id': row['student_id'],
-            'date': str(row['date']),
-            'status': row['status']
+        if not system.update_attendance(student_id, at_date, new_status):
+            return ojsonify({'message': 'Record not found'}), 404
+        invalidate_attendance((student_id, at_date))
+        return ojsonify({
+            'student_id': student_id,
+            'date': at_date,
+            'status': new_status
         })
     except ValueError:
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        return ojsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return ojsonify({'error': str(e)}), 400
 
-@app.route('/attendance/<int:student_id>/<string:date>', methods=['DELETE'])
-def delete_attendance(student_id, date):
+@app.route('/attendance/<int:student_id>/<string:date_str>', methods=['DELETE'])
+def delete_attendance(student_id, date_str):
     try:
-        at_date = datetime.strptime(date, '%Y-%m-%d').date()
-        existing = system.get_attendance(student_id, at_date)
-        if not existing:
-            return jsonify({'message': 'Record not found'}), 404
-        system.delete_attendance(student_id, at_date)
-        return jsonify({'message': f'Attendance for student {student_id} on {date} deleted'})
+        at_date = date.fromisoformat(date_str)
+        if not system.delete_attendance(student_id, at_date):
+            return ojsonify({'message': 'Record not found'}), 404
+        invalidate_attendance((student_id, at_date))
+        return ojsonify({'message': f'Attendance for student {student_id} on {date_str} deleted'})
     except ValueError:
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        return ojsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    # Initialize system before running
-    try:
-        system = init_system()
-        if system is None:
-            print("Failed to initialize system. Please check your database connection.")
-            exit(1)
-        app.run(debug=True, host='0.0.0.0', port=5003)
-    except Exception as e:
-        print(f"Failed to start application: {str(e)}")
-        exit(1)
+    # Local development only; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=5003)
@@ -0,0 +1,12 @@
+import os
+
+# Run with: gunicorn attendance_api:app
+# Every endpoint is a thin wrapper over MySQL I/O, so cooperative gevent
+# workers keep serving other requests while one waits on the database.
+# Each worker multiplexes up to worker_connections requests over its own
+# pool of DB_POOL_MAX MySQL connections (see init_system), so keep
+# workers * DB_POOL_MAX below MySQL's max_connections (151 by default).
+bind = os.environ.get('BIND', '0.0.0.0:5003')
+worker_class = 'gevent'
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
@@ -1,5 +1,78 @@
+import logging
 import pymysql
+from contextlib import contextmanager
+from pymysql.constants import CLIENT
 from datetime import date
+from dbutils.pooled_db import PooledDB
+
+logger = logging.getLogger(__name__)
+
+# All statements live here as constants so every call sends byte-identical SQL
+SQL = {
+    'create_database': "CREATE DATABASE IF NOT EXISTS attendance_db",
+    'create_students': """
+        CREATE TABLE IF NOT EXISTS students (
+            id INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            class VARCHAR(50) NOT NULL,
+            INDEX idx_student_class (class)
+        )
+    """,
+    'create_attendance': """
+        CREATE TABLE IF NOT EXISTS attendance (
+            student_id INT NOT NULL,
+            date DATE NOT NULL,
+            status ENUM('Present','Absent') NOT NULL,
+            CONSTRAINT fk_attendance_student FOREIGN KEY (student_id)
+                REFERENCES students(id) ON DELETE CASCADE,
+            PRIMARY KEY (student_id, date),
+            INDEX idx_attendance_date (date)
+        )
+    """,
+    # Migrations for tables created before the indexes and the cascading FK were added
+    'attendance_fk': (
+        "SELECT CONSTRAINT_NAME AS constraint_name, DELETE_RULE AS delete_rule "
+        "FROM information_schema.REFERENTIAL_CONSTRAINTS "
+        "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'attendance' "
+        "AND REFERENCED_TABLE_NAME = 'students'"
+    ),
+    'drop_attendance_fk': "ALTER TABLE attendance DROP FOREIGN KEY `{name}`",
+    'add_attendance_fk': (
+        "ALTER TABLE attendance ADD CONSTRAINT fk_attendance_student FOREIGN KEY (student_id) "
+        "REFERENCES students(id) ON DELETE CASCADE"
+    ),
+    'existing_indexes': (
+        "SELECT DISTINCT INDEX_NAME AS index_name FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ('students', 'attendance')"
+    ),
+    'add_student_class_index': "ALTER TABLE students ADD INDEX idx_student_class (class)",
+    'add_attendance_date_index': "ALTER TABLE attendance ADD INDEX idx_attendance_date (date)",
+    'drop_attendance': "DROP TABLE IF EXISTS attendance",
+    'drop_students': "DROP TABLE IF EXISTS students",
+    'add_student': "INSERT INTO students (id, name, class) VALUES (%s, %s, %s)",
+    'update_student': "UPDATE students SET name=%s, class=%s WHERE id=%s",
+    'delete_student': "DELETE FROM students WHERE id=%s",
+    'get_student': "SELECT id, name, class FROM students WHERE id=%s",
+    'list_students': "SELECT id, name, class FROM students",
+    # LAST_INSERT_ID(1) only runs on the duplicate-key path, so the statement reports insert id 1
+    # for an existing row (changed or not) and 0 for a fresh insert
+    'mark_attendance': (
+        "INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE status=IF(LAST_INSERT_ID(1), VALUES(status), VALUES(status))"
+    ),
+    'upsert_attendance': (
+        "INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE status=VALUES(status)"
+    ),
+    'update_attendance': "UPDATE attendance SET status=%s WHERE student_id=%s AND date=%s",
+    'delete_attendance': "DELETE FROM attendance WHERE student_id=%s AND date=%s",
+    'get_attendance': "SELECT student_id, date, status FROM attendance WHERE student_id=%s AND date=%s",
+    'list_attendance_by_student': "SELECT date, status FROM attendance WHERE student_id=%s",
+    'list_all_attendance': (
+        "SELECT s.id as student_id, s.name, s.class, a.date, a.status "
+        "FROM attendance a JOIN students s ON a.student_id=s.id"
+    ),
+}
 
 class Student:
     def __init__(self, name="", student_class=""):
@@ -9,6 +82,12 @@ class Student:
     def __str__(self):
         return f"Name: {self.name}, Class: {self.student_class}"  
 
+class NotFoundError(Exception):
+    """Raised when a write references a student that does not exist"""
+
+class AlreadyExistsError(Exception):
+    """Raised when a student is added with an ID that is already taken"""
+
 class AttendanceSystem:
     def __init__(self, host='localhost', port=3306, user='root', password='hello', database='attendance_db', charset='utf8mb4'):
         self.db_config = {
@@ -18,22 +97,36 @@ class AttendanceSystem:
             'password': password,
             'database': database,
             'charset': charset,
-            'cursorclass': pymysql.cursors.DictCursor
+            'cursorclass': pymysql.cursors.DictCursor,
+            # Report matched rather than changed rows so rowcount tells us whether the row exists
+            'client_flag': CLIENT.FOUND_ROWS
         }
+        self.pool = None
+
+    def init_pool(self, mincached=5, maxcached=20, maxconnections=50):
+        """Create the shared connection pool used by connect_db"""
+        self.pool = PooledDB(
+            creator=pymysql,
+            mincached=mincached,
+            maxcached=maxcached,
+            maxconnections=maxconnections,
+            blocking=True,
+            **self.db_config
+        )
 
     def connect_db(self):
         try:
-            conn = pymysql.connect(**self.db_config)
-            print("DB connected")
-            return conn
+            if self.pool is not None:
+                return self.pool.connection()
+            return pymysql.connect(**self.db_config)
         except pymysql.MySQLError as err:
-            print(f"Error connecting to DB: {err}")
+            logger.error("Error connecting to DB: %s", err)
             return None
 
     def disconnect_db(self, conn):
+        # For pooled connections close() hands the connection back to the pool
         if conn:
             conn.close()
-            print("DB disconnected")
 
     def create_database(self):
         try:
@@ -42,260 +135,216 @@ class AttendanceSystem:
             cfg.pop('database')
             conn = pymysql.connect(**cfg)
             cursor = conn.cursor()
-            cursor.execute("CREATE DATABASE IF NOT EXISTS attendance_db;")
-            print("Database 'attendance_db' ensured.")
+            cursor.execute(SQL['create_database'])
+            logger.info("Database 'attendance_db' ensured.")
             cursor.close()
             conn.close()
         except pymysql.MySQLError as err:
-            print(f"Error creating database: {err}")
+            logger.error("Error creating database: %s", err)
 
-    def create_tables(self):
+    @contextmanager
+    def _conn(self):
+        """Yield a connection and always hand it back, even when the caller raises"""
         conn = self.connect_db()
         if not conn:
-            return
+            raise Exception("Failed to connect to database")
         try:
-            cursor = conn.cursor()
-            # Student table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS students (
-                    id INT PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    class VARCHAR(50) NOT NULL
-                );
-                """
-            )
-            # Attendance table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS attendance (
-                    student_id INT NOT NULL,
-                    date DATE NOT NULL,
-                    status ENUM('Present','Absent') NOT NULL,
-                    FOREIGN KEY (student_id) REFERENCES students(id),
-                    PRIMARY KEY (student_id, date)
-                );
-                """
-            )
-            conn.commit()
-            print("Tables 'students' and 'attendance' ensured.")
-        except pymysql.MySQLError as err:
-            print(f"Error creating tables: {err}")
-            conn.rollback()
+            yield conn
         finally:
-            cursor.close()
             self.disconnect_db(conn)
 
+    def create_tables(self):
+        with self._conn() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute(SQL['create_students'])
+                cursor.execute(SQL['create_attendance'])
+                # CREATE TABLE IF NOT EXISTS leaves older tables alone, so bring them up to date here
+                cursor.execute(SQL['existing_indexes'])
+                indexes = {row['index_name'] for row in cursor.fetchall()}
+                if 'idx_student_class' not in indexes:
+                    cursor.execute(SQL['add_student_class_index'])
+                if 'idx_attendance_date' not in indexes:
+                    cursor.execute(SQL['add_attendance_date_index'])
+                cursor.execute(SQL['attendance_fk'])
+                fk = cursor.fetchone()
+                if fk and fk['delete_rule'] != 'CASCADE':
+                    cursor.execute(SQL['drop_attendance_fk'].format(name=fk['constraint_name']))
+                    cursor.execute(SQL['add_attendance_fk'])
+                conn.commit()
+                logger.info("Tables 'students' and 'attendance' ensured.")
+            except pymysql.MySQLError as err:
+                logger.error("Error creating tables: %s", err)
+                conn.rollback()
+
     def modify_students_table(self):
         """Modify the students table to remove the roll_no column"""
-        conn = self.connect_db()
-        if not conn:
-            return
-        try:
-            cursor = conn.cursor()
-            # Drop existing attendance table first (due to foreign key constraint)
-            cursor.execute("DROP TABLE IF EXISTS attendance")
-            # Drop existing students table
-            cursor.execute("DROP TABLE IF EXISTS students")
-            # Create new students table without roll_no column
-            cursor.execute(
-                """
-                CREATE TABLE students (
-                    id INT PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    class VARCHAR(50) NOT NULL
-                );
-                """
-            )
-            # Recreate attendance table
-            cursor.execute(
-                """
-                CREATE TABLE attendance (
-                    student_id INT NOT NULL,
-                    date DATE NOT NULL,
-                    status ENUM('Present','Absent') NOT NULL,
-                    FOREIGN KEY (student_id) REFERENCES students(id),
-                    PRIMARY KEY (student_id, date)
-                );
-                """
-            )
-            conn.commit()
-            print("Students and attendance tables modified successfully")
-        except pymysql.MySQLError as err:
-            print(f"Error modifying students table: {err}")
-            conn.rollback()
-        finally:
-            cursor.close()
-            self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            try:
+                # Drop existing attendance table first (due to foreign key constraint)
+                cursor.execute(SQL['drop_attendance'])
+                # Drop existing students table
+                cursor.execute(SQL['drop_students'])
+                # Create new students table without roll_no column
+                cursor.execute(SQL['create_students'])
+                # Recreate attendance table
+                cursor.execute(SQL['create_attendance'])
+                conn.commit()
+                logger.info("Students and attendance tables modified successfully")
+            except pymysql.MySQLError as err:
+                logger.error("Error modifying students table: %s", err)
+                conn.rollback()
 
     def add_student(self, student: Student, student_id: int = None):
-        conn = self.connect_db()
-        if not conn:
-            raise Exception("Failed to connect to database")
-            
-        try:
-            cursor = conn.cursor()
-            
-            # Check if student ID is provided
-            if student_id is None:
-                raise Exception("Student ID is required")
-                
-            # Check if student ID already exists
-            cursor.execute("SELECT id FROM students WHERE id = %s", (student_id,))
-            if cursor.fetchone():
-                raise Exception(f"Student with ID {student_id} already exists")
-            
-            query = "INSERT INTO students (id, name, class) VALUES (%s, %s, %s)"
-            cursor.execute(query, (student_id, student.name, student.student_class))
-            conn.commit()
-            print(f"Student added with id={student_id}")
-            return student_id
-        except pymysql.Error as err:
-            print(f"Error adding student: {err}")
-            conn.rollback()
-            raise Exception(f"Database error: {str(err)}")
-        finally:
-            if cursor:
-                cursor.close()
-            self.disconnect_db(conn)
+        # Check if student ID is provided
+        if student_id is None:
+            raise ValueError("Student ID is required")
+
+        with self._conn() as conn, conn.cursor() as cursor:
+            try:
+                # The primary key rejects duplicate IDs
+                cursor.execute(SQL['add_student'], (student_id, student.name, student.student_class))
+                conn.commit()
+                logger.debug("Student added with id=%s", student_id)
+                return student_id
+            except pymysql.err.IntegrityError as err:
+                conn.rollback()
+                if err.args[0] == 1062:
+                    raise AlreadyExistsError(f"Student with ID {student_id} already exists")
+                raise Exception(f"Database error: {str(err)}")
+            except pymysql.Error as err:
+                logger.error("Error adding student: %s", err)
+                conn.rollback()
+                raise Exception(f"Database error: {str(err)}")
 
     def update_student(self, sid, new_data: Student):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        query = "UPDATE students SET name=%s, class=%s WHERE id=%s"
-        cursor.execute(query, (new_data.name, new_data.student_class, sid))
-        conn.commit()
-        print(f"Student id={sid} updated.")
-        cursor.close()
-        self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['update_student'], (new_data.name, new_data.student_class, sid))
+            updated = cursor.rowcount > 0
+            conn.commit()
+            logger.debug("Student id=%s updated.", sid)
+            return updated
 
     def delete_student(self, sid):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        # Optionally cascade delete attendance first
-        cursor.execute("DELETE FROM attendance WHERE student_id=%s", (sid,))
-        cursor.execute("DELETE FROM students WHERE id=%s", (sid,))
-        conn.commit()
-        print(f"Student id={sid} and related attendance deleted.")
-        cursor.close()
-        self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            # Attendance rows go with it via ON DELETE CASCADE
+            cursor.execute(SQL['delete_student'], (sid,))
+            deleted = cursor.rowcount > 0
+            conn.commit()
+            logger.debug("Student id=%s and related attendance deleted.", sid)
+            return deleted
 
     def get_student(self, sid):
-        conn = self.connect_db()
-        if not conn:
-            return None
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, class FROM students WHERE id=%s", (sid,))
-            row = cursor.fetchone()
-            return row
-        except pymysql.MySQLError as err:
-            print(f"Error getting student: {err}")
-            return None
-        finally:
-            cursor.close()
-            self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute(SQL['get_student'], (sid,))
+                return cursor.fetchone()
+            except pymysql.MySQLError as err:
+                logger.error("Error getting student: %s", err)
+                return None
 
     def list_students(self):
-        conn = self.connect_db()
-        if not conn:
-            return []
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, class FROM students")
-            rows = cursor.fetchall()
-            return rows
-        except pymysql.MySQLError as err:
-            print(f"Error listing students: {err}")
-            return []
-        finally:
-            cursor.close()
-            self.disconnect_db(conn)
+        # Errors propagate so callers never mistake a failed query for an empty table
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['list_students'])
+            return cursor.fetchall()
 
     # Attendance operations
     def mark_attendance(self, student_id, at_date: date, status: str):
-        conn = self.connect_db()
-        if not conn:
-            raise Exception("Failed to connect to database")
-            
-        try:
-            cursor = conn.cursor()
-            
-            # First check if student exists
-            cursor.execute("SELECT id FROM students WHERE id = %s", (student_id,))
-            if not cursor.fetchone():
-                raise Exception(f"Student with ID {student_id} not found")
-            
-            # Check if attendance already marked for this date
-            cursor.execute(
-                "SELECT student_id FROM attendance WHERE student_id = %s AND date = %s",
-                (student_id, at_date)
-            )
-            if cursor.fetchone():
-                raise Exception(f"Attendance already marked for student {student_id} on {at_date}")
-            
-            # Insert attendance record
-            query = "INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s)"
-            cursor.execute(query, (student_id, at_date, status))
-            conn.commit()
-            print(f"Attendance marked for student_id={student_id} on {at_date}")
-            return (student_id, at_date)
-            
-        except pymysql.Error as err:
-            print(f"Error marking attendance: {err}")
-            conn.rollback()
-            raise Exception(f"Database error: {str(err)}")
-        finally:
-            if cursor:
-                cursor.close()
-            self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            try:
+                # Single upsert; the foreign key does the student check server-side
+                cursor.execute(SQL['mark_attendance'], (student_id, at_date, status))
+                # rowcount cannot tell an insert from an unchanged row under FOUND_ROWS; the insert id can
+                created = cursor.lastrowid == 0
+                conn.commit()
+                logger.debug("Attendance marked for student_id=%s on %s", student_id, at_date)
+                return created
+            except pymysql.err.IntegrityError as err:
+                conn.rollback()
+                if err.args[0] == 1452:
+                    raise NotFoundError(f"Student with ID {student_id} not found")
+                raise Exception(f"Database error: {str(err)}")
+            except pymysql.Error as err:
+                logger.error("Error marking attendance: %s", err)
+                conn.rollback()
+                raise Exception(f"Database error: {str(err)}")
+
+    def mark_attendance_bulk(self, records):
+        """Upsert a batch of (student_id, date, status) records in one transaction.
+
+        Returns the number of records submitted. Under CLIENT.FOUND_ROWS the multi-row rowcount
+        cannot separate inserts from updates, so no created/updated split is reported.
+        """
+        with self._conn() as conn:
+            try:
+                conn.begin()
+                with conn.cursor() as cursor:
+                    # The primary key and foreign key enforce uniqueness and student existence
+                    cursor.executemany(SQL['upsert_attendance'], records)
+                conn.commit()
+                logger.debug("Attendance marked for %d records", len(records))
+                return len(records)
+            except pymysql.err.IntegrityError as err:
+                conn.rollback()
+                if err.args[0] == 1452:
+                    raise NotFoundError("One or more students in the batch were not found")
+                raise Exception(f"Database error: {str(err)}")
+            except pymysql.Error as err:
+                logger.error("Error marking attendance in bulk: %s", err)
+                conn.rollback()
+                raise Exception(f"Database error: {str(err)}")
 
     def update_attendance(self, student_id, at_date: date, new_status: str):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        query = "UPDATE attendance SET status=%s WHERE student_id=%s AND date=%s"
-        cursor.execute(query, (new_status, student_id, at_date))
-        conn.commit()
-        print(f"Attendance updated for student_id={student_id} on {at_date} to {new_status}.")
-        cursor.close()
-        self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['update_attendance'], (new_status, student_id, at_date))
+            updated = cursor.rowcount > 0
+            conn.commit()
+            logger.debug("Attendance updated for student_id=%s on %s to %s.", student_id, at_date, new_status)
+            return updated
 
     def delete_attendance(self, student_id, at_date: date):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM attendance WHERE student_id=%s AND date=%s", (student_id, at_date))
-        conn.commit()
-        print(f"Attendance deleted for student_id={student_id} on {at_date}.")
-        cursor.close()
-        self.disconnect_db(conn)
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['delete_attendance'], (student_id, at_date))
+            deleted = cursor.rowcount > 0
+            conn.commit()
+            logger.debug("Attendance deleted for student_id=%s on %s.", student_id, at_date)
+            return deleted
 
     def get_attendance(self, student_id, at_date: date):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM attendance WHERE student_id=%s AND date=%s", (student_id, at_date))
-        row = cursor.fetchone()
-        cursor.close()
-        self.disconnect_db(conn)
-        return row
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['get_attendance'], (student_id, at_date))
+            return cursor.fetchone()
 
     def list_attendance_by_student(self, student_id):
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(SQL['list_attendance_by_student'], (student_id,))
+            return cursor.fetchall()
+
+    def iter_all_attendance(self):
+        """Run the attendance listing on a server-side cursor and return a row generator"""
         conn = self.connect_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT student_id, date, status FROM attendance WHERE student_id=%s", (student_id,))
-        rows = cursor.fetchall()
-        for r in rows:
-            print(r)
-        cursor.close()
-        self.disconnect_db(conn)
-        return rows
+        if not conn:
+            raise Exception("Failed to connect to database")
+        cursor = None
+        try:
+            cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+            cursor.execute(SQL['list_all_attendance'])
+        except Exception:
+            if cursor:
+                cursor.close()
+            self.disconnect_db(conn)
+            raise
+        return self._stream_rows(conn, cursor)
+
+    def _stream_rows(self, conn, cursor):
+        # Rows are pulled from the server one at a time; the connection outlives this call,
+        # so it is released here once the caller finishes or closes the generator rather than via _conn
+        try:
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+            self.disconnect_db(conn)
 
     def list_all_attendance(self):
-        conn = self.connect_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT s.id as student_id, s.name, s.class, a.date, a.status FROM attendance a JOIN students s ON a.student_id=s.id")
-        rows = cursor.fetchall()
-        for r in rows:
-            print(r)
-        cursor.close()
-        self.disconnect_db(conn)
-        return rows
\ No newline at end of file
+        return list(self.iter_all_attendance())